@@ -1,23 +1,67 @@
 import sqlite3
+import csv
 import pyupbit
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta, timezone
 import time
 import logging
 import os
 import argparse
+import threading
+from functools import lru_cache
+from itertools import chain, islice
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from tqdm import tqdm
 
+# Optional dependency for the Parquet storage backend
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:
+    pa = ds = None
+
 # SQLite datetime adapter registration for Python 3.12 compatibility
 def adapt_datetime(val):
     return val.isoformat()
 
 def convert_datetime(val):
-    return datetime.fromisoformat(val)
+    # Converters always receive the raw bytes of the column value
+    return datetime.fromisoformat(val.decode())
 
 sqlite3.register_adapter(datetime, adapt_datetime)
 sqlite3.register_converter("datetime", convert_datetime)
 
+# API 호출 제한 방지: request starts are spaced out across all threads and collectors.
+# Upbit allows 10 candle requests per second; 0.125s keeps headroom for network jitter.
+_rate_lock = threading.Lock()
+_next_request_at = 0.0
+
+def _wait_for_rate_limit(interval=0.125):
+    global _next_request_at
+    with _rate_lock:
+        wait = _next_request_at - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        _next_request_at = time.monotonic() + interval
+
+class _FailedResponse(Exception):
+    """Raised inside the response cache so failed requests are not memoized"""
+
+@lru_cache(maxsize=1024)
+def _get_ohlcv_cached(ticker, interval, to, count, freshness):
+    """Memoized pyupbit.get_ohlcv keyed by the request arguments
+    
+    `to` is an ISO-8601 string (seconds) so the key is hashable and stable, and
+    `freshness` (the current UTC hour) expires entries so recent pages are refetched.
+    """
+    _wait_for_rate_limit()
+    df = pyupbit.get_ohlcv(ticker, interval=interval, to=to, count=count)
+    if df is None:
+        raise _FailedResponse
+    return df
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -43,22 +87,48 @@ class UpbitCandleCollector:
         'month': 43200
     }
 
-    def __init__(self, coin, timeframe, fiat="KRW", db_path=None, verbose=False, show_progress=False):
+    # Shared INSERT statement so the sqlite3 statement cache is reused across pages.
+    # A page is inserted as one multi-row statement: _INSERT_SQL + n * _INSERT_ROW
+    _INSERT_SQL = 'INSERT OR REPLACE INTO {table} (timestamp, open, high, low, close, volume) VALUES '
+    _INSERT_ROW = '(?, ?, ?, ?, ?, ?)'
+    # SQLite allows 32766 bound parameters per statement since 3.32.0, 999 before
+    _INSERT_MAX_ROWS = (32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999) // 6
+
+    # Fixed-point scales used with fixed_point=True (prices to 1e-4, volume to 1e-8)
+    _PRICE_SCALE = 10_000
+    _VOLUME_SCALE = 100_000_000
+
+    def __init__(self, coin, timeframe, fiat="KRW", db_path=None, verbose=False, show_progress=False,
+                 commit_every=None, max_workers=4, storage_backend='sqlite', fixed_point=False):
         """
         Parameters:
         - coin: Coin symbol (e.g., 'BTC', 'ETH', 'DOGE')
         - timeframe: Time interval (minute1, minute3, minute5, minute10, minute15, minute30, minute60, minute240, day, week, month)
         - fiat: Base currency (KRW, BTC, USDT, default: KRW)
-        - db_path: DB file path (default: db/{coin}_{timeframe}_{fiat}.db)
+        - db_path: DB file path, or dataset directory for Parquet (default: db/{fiat}-{coin}_{timeframe}.db or .parquet)
         - verbose: Enable detailed logging
         - show_progress: Show progress bar (default: False)
+        - commit_every: Commit after every N pages during collection (default: None, single commit per run)
+        - max_workers: Number of concurrent API requests during collection (default: 4)
+        - storage_backend: 'sqlite' or 'parquet' (partitioned by year/month, requires pyarrow) (default: 'sqlite')
+        - fixed_point: Store prices and volume as scaled integers in the ohlcv_fp table (default: False)
         """
+        if storage_backend not in ('sqlite', 'parquet'):
+            raise ValueError(f"Unsupported storage backend: {storage_backend}")
+        if storage_backend == 'parquet' and ds is None:
+            raise ImportError("The parquet storage backend requires pyarrow (pip install pyubcc[parquet])")
+        
         self.coin = coin.upper()
         self.fiat = fiat.upper()
         self.timeframe = timeframe
         self.ticker = f"{self.fiat}-{self.coin}"
         self.verbose = verbose
         self.show_progress = show_progress and not verbose  # Progress bar is not shown in verbose mode
+        self.commit_every = commit_every
+        self.max_workers = max(1, max_workers)
+        self.storage_backend = storage_backend
+        self.fixed_point = fixed_point
+        self.table = 'ohlcv_fp' if fixed_point else 'ohlcv'
         
         # Initialize interval
         self.interval = self.timeframe_minutes.get(self.timeframe, 1)
@@ -68,10 +138,20 @@ class UpbitCandleCollector:
             self.db_path = db_path
         else:
             os.makedirs('db', exist_ok=True)  # Create db directory
-            self.db_path = os.path.join('db', f"{self.ticker}_{timeframe}.db")
+            if self.storage_backend == 'parquet':
+                # Scaled and float candles must not share a dataset directory
+                suffix = '_fp.parquet' if fixed_point else '.parquet'
+            else:
+                suffix = '.db'
+            self.db_path = os.path.join('db', f"{self.ticker}_{timeframe}{suffix}")
         
         # Initialize logging (first priority)
         self._setup_logging()
+        
+        # One connection for the collector's lifetime, shared by reads and collection.
+        # collect() holds the write lock for its transaction.
+        self._conn = self._connect() if self.storage_backend == 'sqlite' else None
+        self._write_lock = threading.Lock()
                 
         # Initialize DB
         self.initialize_db()
@@ -81,29 +161,62 @@ class UpbitCandleCollector:
         self.logger = logging.getLogger(f"pyubcc.{self.ticker}")
         self.logger.setLevel(logging.DEBUG if self.verbose else logging.INFO)
 
+    def _connect(self):
+        """Open a SQLite connection with the collector's PRAGMA settings applied
+
+        journal_mode=WAL persists in the database file, but synchronous and the
+        other settings are per-connection, so they are applied here.
+        """
+        conn = sqlite3.connect(self.db_path, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=536870912")  # 512 MB memory-mapped I/O
+        conn.execute("PRAGMA cache_size=-131072")  # 128 MB page cache
+        return conn
+
+    def close(self):
+        """Close the database connection"""
+        conn = getattr(self, '_conn', None)
+        if conn is not None:
+            conn.close()
+            self._conn = None
+
+    def __del__(self):
+        self.close()
+
     def initialize_db(self):
         """Initialize the database"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS ohlcv (
-                    timestamp DATETIME PRIMARY KEY,
-                    open REAL,
-                    high REAL,
-                    low REAL,
-                    close REAL,
-                    volume REAL
-                ) WITHOUT ROWID
-            ''')
-            conn.commit()
+        if self.storage_backend == 'parquet':
+            # The dataset directory is created on the first write
+            return
+        
+        column_type = 'INTEGER' if self.fixed_point else 'REAL'
+        cursor = self._conn.cursor()
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {self.table} (
+                timestamp DATETIME PRIMARY KEY,
+                open {column_type},
+                high {column_type},
+                low {column_type},
+                close {column_type},
+                volume {column_type}
+            ) WITHOUT ROWID
+        ''')
+        self._conn.commit()
 
     def _get_last_timestamp(self):
         """Query the timestamp of the last saved data"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('SELECT MIN(timestamp), MAX(timestamp) FROM ohlcv')
-            min_date, max_date = cursor.fetchone()
-            return min_date, max_date
+        if self.storage_backend == 'parquet':
+            timestamps = self._read_parquet(columns=['timestamp']).index
+            if timestamps.empty:
+                return None, None
+            return timestamps.min().isoformat(), timestamps.max().isoformat()
+        
+        cursor = self._conn.cursor()
+        cursor.execute(f'SELECT MIN(timestamp), MAX(timestamp) FROM {self.table}')
+        min_date, max_date = cursor.fetchone()
+        return min_date, max_date
 
     def check_db_status(self):
         """Check database status"""
@@ -166,94 +279,102 @@ class UpbitCandleCollector:
         total_candles = self._calculate_total_candles(self.start_date, self.end_date)
         collected_candles = 0
         
-        # 시작일과 종료일을 timeframe 간격에 맞춰 보정
-        adjusted_start = self.start_date
-        adjusted_end = self.end_date
-        
-        # 시작일 보정 (09:00 이전이면 09:00으로 조정)
-        if adjusted_start.hour < 9:
-            adjusted_start = adjusted_start.replace(hour=9, minute=0, second=0, microsecond=0)
-        
-        # 시작일을 timeframe 간격에 맞춰 보정
-        minutes_from_nine = (adjusted_start.hour - 9) * 60 + adjusted_start.minute
-        if minutes_from_nine % self.interval != 0:
-            # 이전 간격으로 내림 조정
-            minutes_to_subtract = minutes_from_nine % self.interval
-            adjusted_start = adjusted_start - timedelta(minutes=minutes_to_subtract)
-        # 초와 마이크로초를 0으로 설정
-        adjusted_start = adjusted_start.replace(second=0, microsecond=0)
-        
-        # 종료일을 timeframe 간격에 맞춰 보정 (이전 캔들 종료 시간으로)
-        minutes_total = (adjusted_end.hour * 60 + adjusted_end.minute)
-        if minutes_total % self.interval != 0:
-            # 이전 간격으로 내림 조정
-            minutes_to_subtract = minutes_total % self.interval
-            adjusted_end = adjusted_end - timedelta(minutes=minutes_to_subtract)
-        # 초와 마이크로초를 0으로 설정
-        adjusted_end = adjusted_end.replace(second=0, microsecond=0)
+        # 시작일과 종료일을 timeframe 간격에 맞춰 보정 (이전 간격으로 내림, 초와 마이크로초는 0으로)
+        adjusted_start = self.start_date + timedelta(
+            minutes=self._start_alignment_minutes(self.start_date, round_up=False),
+            seconds=-self.start_date.second, microseconds=-self.start_date.microsecond)
+        adjusted_end = self.end_date + timedelta(
+            minutes=self._end_alignment_minutes(self.end_date),
+            seconds=-self.end_date.second, microseconds=-self.end_date.microsecond)
         
         if self.verbose:
             self.logger.debug(f"Collection period (before adjustment): {self.start_date} ~ {self.end_date}")
             self.logger.debug(f"Collection period (after adjustment): {adjusted_start} ~ {adjusted_end}")
             self.logger.debug(f"Expected candles: {total_candles}")
         
-        with sqlite3.connect(self.db_path, detect_types=sqlite3.PARSE_DECLTYPES|sqlite3.PARSE_COLNAMES) as conn:
-            current_date = self.end_date  # 최신 데이터부터 시작
+        use_sqlite = self.storage_backend == 'sqlite'
+        conn = self._conn
+        with self._write_lock:
             pbar = None
+            pages = 0
+            frames = []  # Parquet backend: pages buffered for a single dataset write
 
-            while current_date > self.start_date:
-                try:
-                    # Calculate the number of candles needed based on time difference
-                    time_diff_minutes = int((current_date - self.start_date).total_seconds() / 60)
-                    needed_candles = min(200, time_diff_minutes // self.interval)
-                    count = max(1, needed_candles)  # Ensure at least 1 candle is requested
-                    
-                    df = pyupbit.get_ohlcv(self.ticker, interval=self.timeframe,
-                                          to=current_date - timedelta(hours=9),
-                                          count=count)
-                    
-                    if df is not None and not df.empty:
-                        # Sort DataFrame by timestamp to ensure sequential processing
-                        df = df.sort_index()
-                        
-                        # Get the actual time range of received data
-                        actual_start = df.index[0]
-                        actual_end = df.index[-1]
-                        
-                        saved_count = self._save_dataframe_to_db(df, conn)
-                        collected_candles += saved_count
-                        
-                        # Update current_date for the next iteration
-                        current_date = actual_start
-                        
-                        # Initialize progress bar if not exists and show_progress is True
-                        if pbar is None and self.show_progress:
-                            pbar = tqdm(total=total_candles, desc=f"{self.ticker}", unit=" candles")
-                            # Initialize collected_candles counter for gap detection
-                            collected_candles = 0
-                        
-                        # Update progress bar if it exists
-                        if pbar is not None:
-                            # Update total if we detect gaps
-                            if saved_count < count:
-                                gap_size = count - saved_count
-                                pbar.total -= gap_size
-                                pbar.refresh()
-                            pbar.update(saved_count)
+            # Fetch pages concurrently, but save them one by one from this thread
+            # so SQLite keeps a single writer. The whole collection runs in a single transaction.
+            # Only a few pages per worker are in flight, so saved pages can be freed right away.
+            executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            anchors = iter(self._page_anchors(self.start_date, self.end_date))
+            futures = deque(
+                (count, executor.submit(self._fetch_ohlcv, to, count))
+                for to, count in islice(anchors, self.max_workers * 2)
+            )
+            if use_sqlite:
+                cursor = conn.cursor()
+                conn.execute("BEGIN")
+            try:
+                while futures:
+                    count, future = futures.popleft()
+                    for to, next_count in islice(anchors, 1):
+                        futures.append((next_count, executor.submit(self._fetch_ohlcv, to, next_count)))
+                    try:
+                        df = future.result()
                         
-                        if self.verbose:
-                            self.logger.debug(f"Collection period: {actual_start} ~ {actual_end}")
-                    else:
-                        # 데이터가 없는 경우 이전 구간으로 이동
-                        current_date -= timedelta(minutes=200 * self.interval)
-                    
-                    time.sleep(0.1)  # API 호출 제한 방지
+                        if df is not None and not df.empty:
+                            # Sort DataFrame by timestamp to ensure sequential processing
+                            # (Upbit pages are normally already in order, so only sort when needed)
+                            if not df.index.is_monotonic_increasing:
+                                df = df.sort_index()
+                            
+                            if use_sqlite:
+                                saved_count = self._save_dataframe_to_db(df, cursor)
+                            else:
+                                frames.append(df)
+                                saved_count = len(df)
+                            collected_candles += saved_count
+                            
+                            pages += 1
+                            if use_sqlite and self.commit_every and pages % self.commit_every == 0:
+                                conn.commit()
+                            
+                            # Initialize progress bar if not exists and show_progress is True
+                            if pbar is None and self.show_progress:
+                                # Redraw at most every 0.5s / 1/500th of the total to limit terminal writes
+                                pbar = tqdm(total=total_candles, desc=f"{self.ticker}", unit=" candles",
+                                            mininterval=0.5, miniters=max(1, total_candles // 500))
+                                # Initialize collected_candles counter for gap detection
+                                collected_candles = 0
+                            
+                            # Update progress bar if it exists
+                            if pbar is not None:
+                                # Update total if we detect gaps (shown on the next redraw)
+                                if saved_count < count:
+                                    gap_size = count - saved_count
+                                    pbar.total -= gap_size
+                                pbar.update(saved_count)
+                            
+                            if self.verbose:
+                                # Get the actual time range of received data
+                                self.logger.debug(f"Collection period: {df.index[0]} ~ {df.index[-1]}")
                     
-                except Exception as e:
-                    if self.verbose:
-                        self.logger.error(f"Error occurred during data collection: {str(e)}")
-                    raise
-                
+                    except Exception as e:
+                        if self.verbose:
+                            self.logger.error(f"Error occurred during data collection: {str(e)}")
+                        raise
+            finally:
+                # Drop requests that have not started yet
+                for _, future in futures:
+                    future.cancel()
+                executor.shutdown(wait=True)
+                # Keep whatever was saved so the next run can resume from it
+                if use_sqlite:
+                    conn.commit()
+                elif frames:
+                    self._save_dataframes_to_parquet(frames)
+            
+            if use_sqlite:
+                # Refresh planner statistics for the range/window queries below
+                conn.execute(f"ANALYZE {self.table}")
+
             if pbar is not None:
                 pbar.close()
         
@@ -267,6 +388,58 @@ class UpbitCandleCollector:
         
         return total_count, expected_candles, timestamp_order_mismatches, gaps
 
+    def _page_anchors(self, start_date, end_date):
+        """Split the collection period into API pages
+        
+        Walks backward from end_date in windows of 200 candles. The bookkeeping
+        is done on integer seconds since a naive epoch (the dates are KST wall-clock
+        values, so the local timezone and its DST changes must not apply); a
+        datetime is only built for `to=`.
+        
+        Returns:
+        - list: (to, count) tuples, newest page first, with `to` in UTC
+        """
+        epoch = datetime(1970, 1, 1)
+        end_ts = int((end_date - epoch).total_seconds())
+        start_ts = int((start_date - epoch).total_seconds())
+        interval_s = self.interval * 60
+        kst_offset = 9 * 3600
+        
+        anchors = []
+        cur_ts = end_ts  # 최신 데이터부터 시작
+        while cur_ts > start_ts:
+            # Calculate the number of candles needed based on time difference, rounding up
+            # so the last page still includes the candle starting at start_date
+            count = min(200, -(-(cur_ts - start_ts) // interval_s))
+            anchors.append((epoch + timedelta(seconds=cur_ts - kst_offset), count))
+            cur_ts -= 200 * interval_s
+        return anchors
+
+    def _fetch_ohlcv(self, to, count, retries=3, backoff=0.5):
+        """Fetch a single page of candles ending at `to` (UTC)
+        
+        Responses are cached for the current hour, so overlapping pages of
+        repeated or resumed runs skip the API call. pyupbit returns None both
+        for rejected requests (e.g. 429 rate limiting) and for periods without
+        candles, so a failed page is retried with exponential backoff before
+        it is skipped with a warning.
+        """
+        freshness = datetime.now(timezone.utc).strftime('%Y%m%d%H')
+        to = to.strftime('%Y-%m-%d %H:%M:%S')
+        for attempt in range(retries + 1):
+            try:
+                df = _get_ohlcv_cached(self.ticker, self.timeframe, to, count, freshness)
+            except _FailedResponse:
+                if attempt < retries:
+                    time.sleep(backoff * 2 ** attempt)
+                continue
+            # Callers may modify the page, so never hand out the cached object itself
+            return df.copy()
+        
+        self.logger.warning(f"No data received for {count} candles before {to} (UTC) "
+                            f"after {retries + 1} attempts; skipping this page")
+        return None
+
     def calculate_minutes_between(self, start_date, end_date):
         """Calculate the exact number of minutes between two timestamps"""
         # Calculate time difference between start and end dates
@@ -277,63 +450,80 @@ class UpbitCandleCollector:
         
         return total_minutes
 
+    def _start_alignment_minutes(self, start_date, round_up):
+        """Minutes to add to start_date to reach a candle boundary
+        
+        Candles are counted from 09:00 (KST day start); a start before 09:00 moves to 09:00.
+        
+        Parameters:
+        - start_date: Start date to align
+        - round_up: Align to the next boundary instead of the previous one
+        """
+        minutes_of_day = start_date.hour * 60 + start_date.minute
+        if minutes_of_day < 9 * 60:
+            return 9 * 60 - minutes_of_day
+        remainder = (minutes_of_day - 9 * 60) % self.interval
+        if not remainder:
+            return 0
+        return self.interval - remainder if round_up else -remainder
+
+    def _end_alignment_minutes(self, end_date):
+        """Minutes to add to end_date to reach the previous candle boundary (zero or negative)"""
+        return -((end_date.hour * 60 + end_date.minute) % self.interval)
+
     def _calculate_total_candles(self, start_date, end_date):
         """Calculate total number of candles needed"""
-        # Adjust start time to 09:00 if earlier
+        # Shift start to the next candle start time and end to the previous candle end time
+        start_shift = self._start_alignment_minutes(start_date, round_up=True) * 60
         if start_date.hour < 9:
-            start_date = start_date.replace(hour=9, minute=0, second=0, microsecond=0)
-        
-        # Adjust start date to match timeframe interval
-        minutes_from_nine = (start_date.hour - 9) * 60 + start_date.minute
-        if minutes_from_nine % self.interval != 0:
-            # Adjust to next candle start time
-            minutes_to_add = self.interval - (minutes_from_nine % self.interval)
-            start_date = start_date + timedelta(minutes=minutes_to_add)
-        
-        # Adjust end date to match timeframe interval
-        minutes_total = (end_date.hour * 60 + end_date.minute)
-        if minutes_total % self.interval != 0:
-            # Adjust to previous candle end time
-            minutes_to_subtract = minutes_total % self.interval
-            end_date = end_date - timedelta(minutes=minutes_to_subtract)
+            # Starting at 09:00 also drops the seconds of the original start
+            start_shift -= start_date.second + start_date.microsecond / 1_000_000
+        end_shift = self._end_alignment_minutes(end_date) * 60
         
         # Calculate total minutes between start and end dates (24-hour continuous trading)
-        total_minutes = int(self.calculate_minutes_between(start_date, end_date))
+        total_seconds = (end_date - start_date).total_seconds() + end_shift - start_shift
+        total_minutes = int(total_seconds / 60)
         
         # Calculate number of candles by dividing by interval
         return total_minutes // self.interval
 
-    def _save_dataframe_to_db(self, df, conn):
+    def _save_dataframe_to_db(self, df, cursor, commit=False):
         """Save DataFrame to SQLite database
         
         Parameters:
         - df: DataFrame containing OHLCV data
-        - conn: SQLite connection object
+        - cursor: SQLite cursor, reused across pages by the caller
+        - commit: Commit after inserting (default: False, the caller owns the transaction)
         
         Returns:
         - int: Number of records saved
         """
-        cursor = conn.cursor()
+        conn = cursor.connection
         saved_count = 0
+        df = self._to_storage(df)
         
         try:
-            # Prepare data for insertion
-            data = [
-                (index.to_pydatetime(), row['open'], row['high'],
-                 row['low'], row['close'], row['volume'])
-                for index, row in df.iterrows()
-            ]
-            
-            # Insert data using REPLACE to handle duplicates
-            cursor.executemany(
-                'INSERT OR REPLACE INTO ohlcv (timestamp, open, high, low, close, volume) '
-                'VALUES (?, ?, ?, ?, ?, ?)',
-                data
+            # Prepare data for insertion (column-wise, converted in C instead of per-row boxing)
+            columns = (
+                df.index.to_pydatetime(),
+                df['open'].to_numpy().tolist(),
+                df['high'].to_numpy().tolist(),
+                df['low'].to_numpy().tolist(),
+                df['close'].to_numpy().tolist(),
+                df['volume'].to_numpy().tolist()
             )
             
-            # Commit changes
-            conn.commit()
-            saved_count = len(data)
+            # Insert data using REPLACE to handle duplicates, one statement per chunk of rows.
+            # Parameters are flattened straight from the columns without building row tuples first.
+            for i in range(0, len(df), self._INSERT_MAX_ROWS):
+                rows = zip(*(column[i:i + self._INSERT_MAX_ROWS] for column in columns))
+                values_clause = ', '.join([self._INSERT_ROW] * min(self._INSERT_MAX_ROWS, len(df) - i))
+                cursor.execute(self._INSERT_SQL.format(table=self.table) + values_clause,
+                               list(chain.from_iterable(rows)))
+            
+            if commit:
+                conn.commit()
+            saved_count = len(df)
             
             if self.verbose:
                 self.logger.debug(f"Saved {saved_count} records to database")
@@ -341,11 +531,140 @@ class UpbitCandleCollector:
         except Exception as e:
             if self.verbose:
                 self.logger.error(f"Error saving data to database: {str(e)}")
-            conn.rollback()
+            if commit:
+                conn.rollback()
             raise
         
         return saved_count
 
+    def _save_dataframes_to_parquet(self, frames):
+        """Save DataFrames to the partitioned Parquet dataset
+        
+        Partitions touched by the new data are rewritten together with their
+        existing rows, so re-collected candles replace older ones like
+        INSERT OR REPLACE does for SQLite.
+        
+        Parameters:
+        - frames: List of DataFrames containing OHLCV data
+        
+        Returns:
+        - int: Number of records saved
+        """
+        df = self._to_storage(pd.concat(frames)[['open', 'high', 'low', 'close', 'volume']])
+        df.index = pd.DatetimeIndex(df.index, name='timestamp')
+        saved_count = len(df)
+        
+        partitions = set(zip(df.index.year, df.index.month))
+        if os.path.isdir(self.db_path):
+            partition_filter = None
+            for year, month in partitions:
+                condition = (ds.field('year') == year) & (ds.field('month') == month)
+                partition_filter = condition if partition_filter is None else partition_filter | condition
+            existing = self._read_parquet(partition_filter=partition_filter)
+            df = pd.concat([existing, df])
+        
+        # Keep the most recently collected candle for each timestamp
+        df = df[~df.index.duplicated(keep='last')].sort_index()
+        df['year'] = df.index.year.astype('int16')
+        df['month'] = df.index.month.astype('int8')
+        
+        ds.write_dataset(
+            pa.Table.from_pandas(df.reset_index(), preserve_index=False),
+            base_dir=self.db_path,
+            format='parquet',
+            partitioning=self._parquet_partitioning(),
+            file_options=ds.ParquetFileFormat().make_write_options(compression='zstd'),
+            existing_data_behavior='delete_matching'
+        )
+        
+        if self.verbose:
+            self.logger.debug(f"Saved {saved_count} records to {self.db_path}")
+        
+        return saved_count
+
+    def _to_storage(self, df):
+        """Convert OHLCV columns to their stored representation (scaled int64 if fixed_point)"""
+        if not self.fixed_point:
+            return df
+        
+        df = df.copy()
+        prices = ['open', 'high', 'low', 'close']
+        df[prices] = self._scale_to_int64(df[prices].to_numpy(), self._PRICE_SCALE, 'price')
+        df['volume'] = self._scale_to_int64(df['volume'].to_numpy(), self._VOLUME_SCALE, 'volume')
+        return df
+
+    def _scale_to_int64(self, values, scale, name):
+        """Scale values to int64, refusing values that would overflow or lose precision"""
+        scaled = values * scale
+        rounded = np.round(scaled)
+        if not np.all(np.isfinite(scaled)):
+            raise ValueError(f"{self.ticker} {name} contains NaN or infinite values; use fixed_point=False")
+        if not np.all(np.abs(rounded) < 2.0 ** 63):
+            raise ValueError(f"{self.ticker} {name} exceeds the fixed-point range "
+                             f"(|value| < {2.0 ** 63 / scale:g}); use fixed_point=False")
+        if not np.allclose(scaled, rounded, rtol=1e-12, atol=1e-6):
+            raise ValueError(f"{self.ticker} {name} has more precision than the fixed-point scale "
+                             f"(1/{scale}) keeps; use fixed_point=False")
+        return rounded.astype('int64')
+
+    def _from_storage(self, df):
+        """Convert stored OHLCV columns back to floats"""
+        if not self.fixed_point or df.empty:
+            return df
+        
+        prices = ['open', 'high', 'low', 'close']
+        df[prices] = df[prices].to_numpy() / self._PRICE_SCALE
+        df['volume'] = df['volume'].to_numpy() / self._VOLUME_SCALE
+        return df
+
+    def _parquet_partitioning(self):
+        """Directory partitioning of the Parquet dataset (year/month)"""
+        return ds.partitioning(pa.schema([('year', pa.int16()), ('month', pa.int8())]))
+
+    def _read_parquet(self, start_date=None, end_date=None, columns=None, partition_filter=None):
+        """Read OHLCV data from the Parquet dataset
+        
+        Parameters:
+        - start_date: Start date for data retrieval
+        - end_date: End date for data retrieval
+        - columns: Columns to read including 'timestamp' (default: all OHLCV columns)
+        - partition_filter: Additional dataset filter expression
+        
+        Returns:
+        - DataFrame indexed by timestamp, in chronological order
+        """
+        columns = columns or ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+        if not os.path.isdir(self.db_path):
+            return pd.DataFrame(columns=columns).set_index('timestamp')
+        
+        filter_expression = partition_filter
+        for operator, value in (('>=', start_date), ('<=', end_date)):
+            if value:
+                field = ds.field('timestamp')
+                value = pd.Timestamp(value).to_pydatetime()
+                condition = field >= value if operator == '>=' else field <= value
+                filter_expression = condition if filter_expression is None else filter_expression & condition
+        
+        dataset = ds.dataset(self.db_path, format='parquet', partitioning=self._parquet_partitioning())
+        df = dataset.to_table(columns=columns, filter=filter_expression).to_pandas()
+        return df.set_index('timestamp').sort_index()
+
+    def _time_where(self, start_date=None, end_date=None):
+        """Build a parameterized WHERE clause for a timestamp range
+        
+        Returns:
+        - tuple: (where_clause, params)
+        """
+        time_conditions = []
+        params = []
+        for operator, value in (('>=', start_date), ('<=', end_date)):
+            if value:
+                time_conditions.append(f"timestamp {operator} ?")
+                # Bind datetimes (including pd.Timestamp) in the same ISO format they are stored in
+                params.append(adapt_datetime(value) if isinstance(value, datetime) else value)
+        time_where = f"WHERE {' AND '.join(time_conditions)}" if time_conditions else ""
+        return time_where, params
+
     def verify_data(self, start_date=None, end_date=None):
         """Verify collected data
         
@@ -353,36 +672,35 @@ class UpbitCandleCollector:
         - start_date: Start date for verification (default: None, entire period)
         - end_date: End date for verification (default: None, entire period)
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Create time conditions
-            time_conditions = []
-            if start_date:
-                time_conditions.append(f"timestamp >= '{start_date}'")
-            if end_date:
-                time_conditions.append(f"timestamp <= '{end_date}'")
-            time_where = f"WHERE {' AND '.join(time_conditions)}" if time_conditions else ""
-            
-            # Get total count
-            cursor.execute(f'SELECT COUNT(*) FROM ohlcv {time_where}')
-            total_count = cursor.fetchone()[0]
-            
-            # Verify timestamp order
-            cursor.execute(f'''
-                WITH ordered_timestamps AS (
-                    SELECT timestamp, 
-                           LAG(timestamp) OVER (ORDER BY timestamp) as prev_timestamp
-                    FROM ohlcv
-                    {time_where}
-                )
-                SELECT COUNT(*) 
-                FROM ordered_timestamps
-                WHERE prev_timestamp >= timestamp
-            ''')
-            timestamp_order_mismatches = cursor.fetchone()[0]
-            
-            return total_count, timestamp_order_mismatches
+        if self.storage_backend == 'parquet':
+            df = self._read_parquet(start_date, end_date, columns=['timestamp'])
+            # Rows come back sorted, so an order mismatch can only be a duplicated timestamp
+            return len(df), int(df.index.duplicated().sum())
+        
+        cursor = self._conn.cursor()
+        
+        # Create time conditions
+        time_where, params = self._time_where(start_date, end_date)
+        
+        # Get total count
+        cursor.execute(f'SELECT COUNT(*) FROM {self.table} {time_where}', params)
+        total_count = cursor.fetchone()[0]
+        
+        # Verify timestamp order
+        cursor.execute(f'''
+            WITH ordered_timestamps AS (
+                SELECT timestamp, 
+                       LAG(timestamp) OVER (ORDER BY timestamp) as prev_timestamp
+                FROM {self.table}
+                {time_where}
+            )
+            SELECT COUNT(*) 
+            FROM ordered_timestamps
+            WHERE prev_timestamp >= timestamp
+        ''', params)
+        timestamp_order_mismatches = cursor.fetchone()[0]
+        
+        return total_count, timestamp_order_mismatches
 
     def get_ohlcv_data(self, start_date=None, end_date=None, filter_gaps=True):
         """Retrieve stored OHLCV data
@@ -392,38 +710,32 @@ class UpbitCandleCollector:
         - end_date: End date for data retrieval
         - filter_gaps: Whether to filter data gaps (default: True)
         """
-        with sqlite3.connect(self.db_path) as conn:
-            query = 'SELECT * FROM ohlcv'
-            conditions = []
-            
-            if start_date:
-                conditions.append(f"timestamp >= '{start_date}'")
-            if end_date:
-                conditions.append(f"timestamp <= '{end_date}'")
-            
-            if conditions:
-                query += ' WHERE ' + ' AND '.join(conditions)
-            
-            query += ' ORDER BY timestamp'
+        if self.storage_backend == 'parquet':
+            df = self._read_parquet(start_date, end_date)
+        else:
+            time_where, params = self._time_where(start_date, end_date)
+            query = f'SELECT * FROM {self.table} {time_where} ORDER BY timestamp'
             
             # Convert to DataFrame
-            df = pd.read_sql_query(query, conn, index_col='timestamp', 
-                                 parse_dates=['timestamp'])
+            df = pd.read_sql_query(query, self._conn, params=params, index_col='timestamp', 
+                                   parse_dates=['timestamp'])
+    
+        df = self._from_storage(df)
+        
+        if filter_gaps and not df.empty:
+            # Calculate time differences between consecutive timestamps
+            time_diff = df.index.to_series().diff()
+            expected_diff = pd.Timedelta(minutes=self.interval)
             
-            if filter_gaps and not df.empty:
-                # Calculate time differences between consecutive timestamps
-                time_diff = df.index.to_series().diff()
-                expected_diff = pd.Timedelta(minutes=self.interval)
-                
-                # Filter only data with normal intervals
-                valid_indices = time_diff == expected_diff
-                # Set first record to True as diff calculation results in NaT
-                valid_indices.iloc[0] = True
-                
-                # Filter data with gaps
-                df = df[valid_indices]
+            # Filter only data with normal intervals
+            valid_indices = time_diff == expected_diff
+            # Set first record to True as diff calculation results in NaT
+            valid_indices.iloc[0] = True
             
-            return df
+            # Filter data with gaps
+            df = df[valid_indices]
+        
+        return df
 
     def export_to_csv(self, start_date=None, end_date=None):
         """Export OHLCV data to CSV file"""
@@ -431,74 +743,135 @@ class UpbitCandleCollector:
         os.makedirs('csv', exist_ok=True)
         csv_filename = f"csv/{self.ticker}_{self.timeframe}_{datetime.now().strftime('%Y%m%d_%H%M')}.csv"
         
-        # Retrieve data
-        df = self.get_ohlcv_data(start_date, end_date)
-        
-        if df.empty:
+        if self.storage_backend == 'parquet':
+            # Retrieve data
+            df = self.get_ohlcv_data(start_date, end_date)
+            
+            if df.empty:
+                self.logger.warning("No data to export.")
+                return None
+                
+            # Save to CSV file
+            df.to_csv(csv_filename)
+            self.logger.info(f"CSV file saved: {csv_filename}")
+            return csv_filename
+        
+        # Stream rows straight from SQLite, dropping rows after a gap like get_ohlcv_data(filter_gaps=True)
+        time_where, params = self._time_where(start_date, end_date)
+        if self.fixed_point:
+            price_scale = float(self._PRICE_SCALE)
+            columns = ', '.join(f"{column} / {price_scale}" for column in ('open', 'high', 'low', 'close'))
+            columns += f", volume / {float(self._VOLUME_SCALE)}"
+        else:
+            columns = 'open, high, low, close, volume'
+        cursor = self._conn.cursor()
+        cursor.execute(f'''
+            WITH ordered_candles AS (
+                SELECT timestamp, {columns},
+                       LAG(timestamp) OVER (ORDER BY timestamp) as prev_timestamp
+                FROM {self.table}
+                {time_where}
+            )
+            SELECT * FROM ordered_candles
+            WHERE prev_timestamp IS NULL
+               OR strftime('%s', timestamp) - strftime('%s', prev_timestamp) = ?
+            ORDER BY timestamp
+        ''', [*params, self.interval * 60])
+        
+        row = cursor.fetchone()
+        if row is None:
             self.logger.warning("No data to export.")
             return None
-            
+        
         # Save to CSV file
-        df.to_csv(csv_filename)
+        with open(csv_filename, 'w', newline='') as f:
+            writer = csv.writer(f, lineterminator=os.linesep)
+            writer.writerow(['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+            writer.writerow(row[:6])
+            for row in cursor:
+                writer.writerow(row[:6])
         self.logger.info(f"CSV file saved: {csv_filename}")
         return csv_filename
 
+    def _gap_boundaries(self, start_date=None, end_date=None):
+        """Find consecutive timestamp pairs that are further apart than the interval
+        
+        Returns:
+        - tuple: (previous, next) int64 nanosecond arrays, or None if there is no data in the range
+        """
+        if self.storage_backend == 'parquet':
+            timestamps = self._read_parquet(start_date, end_date, columns=['timestamp']).index
+            if timestamps.empty:
+                return None
+            ts_ns = timestamps.asi8
+            gap_idx = np.flatnonzero(np.diff(ts_ns) > self.interval * 60 * 10**9)
+            return ts_ns[gap_idx], ts_ns[gap_idx + 1]
+        
+        cursor = self._conn.cursor()
+        
+        time_where, params = self._time_where(start_date, end_date)
+        
+        cursor.execute(f'SELECT EXISTS (SELECT 1 FROM {self.table} {time_where})', params)
+        if not cursor.fetchone()[0]:
+            return None
+        
+        # Let SQLite compare consecutive timestamps and return only the gap boundaries
+        cursor.execute(f'''
+            WITH ordered_timestamps AS (
+                SELECT timestamp,
+                       LAG(timestamp) OVER (ORDER BY timestamp) as prev_timestamp
+                FROM {self.table}
+                {time_where}
+            )
+            SELECT prev_timestamp, timestamp
+            FROM ordered_timestamps
+            WHERE prev_timestamp IS NOT NULL
+              AND strftime('%s', timestamp) - strftime('%s', prev_timestamp) > ?
+            ORDER BY timestamp
+        ''', [*params, self.interval * 60])
+        
+        rows = cursor.fetchall()
+        prev_ns = pd.to_datetime([row[0] for row in rows]).asi8
+        next_ns = pd.to_datetime([row[1] for row in rows]).asi8
+        return prev_ns, next_ns
+
     def analyze_gaps(self, start_date=None, end_date=None):
         """Analyze gaps in candle data from database"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Get all timestamps in chronological order
-            query = 'SELECT timestamp FROM ohlcv'
-            conditions = []
-            if start_date:
-                conditions.append(f"timestamp >= '{start_date}'")
-            if end_date:
-                conditions.append(f"timestamp <= '{end_date}'")
-            if conditions:
-                query += ' WHERE ' + ' AND '.join(conditions)
-            query += ' ORDER BY timestamp'
-            
-            cursor.execute(query)
-            timestamps = [datetime.fromisoformat(row[0]) if isinstance(row[0], str) else row[0] for row in cursor.fetchall()]
-            
-            if not timestamps:
-                self.logger.info("Database is empty.")
-                return []
-            
-            gaps = []
-            expected_interval = timedelta(minutes=self.interval)
-            missing_timestamps = []
-            
-            for i in range(len(timestamps) - 1):
-                current = timestamps[i]
-                next_time = timestamps[i + 1]
-                actual_interval = next_time - current
-                
-                # Treat as GAP if actual interval is larger than expected
-                if actual_interval > expected_interval:
-                    # Calculate number of missing candles
-                    missing_count = int((actual_interval.total_seconds() / 60 / self.interval) - 1)
-                    
-                    # Calculate each missing timestamp
-                    for j in range(missing_count):
-                        missing_time = current + expected_interval * (j + 1)
-                        missing_timestamps.append(missing_time)
-                    
-                    gaps.append({
-                        'start': current,
-                        'end': next_time,
-                        'duration': str(actual_interval),
-                        'missing_candles': missing_count
-                    })
-            
-            # Print results
-            if gaps:
-                print(f"\nNumber of missing candles: {len(missing_timestamps)}")
-                print("List of missing candles:")
-                for timestamp in missing_timestamps:
-                    print(f"- {timestamp}")
-            else:
-                print("No missing candles found.")
-            
-            return gaps
+        boundaries = self._gap_boundaries(start_date, end_date)
+        if boundaries is None:
+            self.logger.info("Database is empty.")
+            return []
+        
+        prev_ns, next_ns = boundaries
+        interval_ns = self.interval * 60 * 10**9
+        
+        # Calculate number of missing candles
+        missing_counts = (next_ns - prev_ns) // interval_ns - 1
+        
+        # Calculate each missing timestamp: prev + interval * (j + 1) for j in range(missing_count)
+        total_missing = int(missing_counts.sum())
+        group_starts = np.repeat(np.cumsum(missing_counts) - missing_counts, missing_counts)
+        steps = np.arange(total_missing) - group_starts + 1
+        missing_timestamps = pd.to_datetime(np.repeat(prev_ns, missing_counts) + steps * interval_ns).to_pydatetime()
+        
+        gaps = []
+        for current, next_time, missing_count in zip(pd.to_datetime(prev_ns).to_pydatetime(),
+                                                     pd.to_datetime(next_ns).to_pydatetime(),
+                                                     missing_counts.tolist()):
+            gaps.append({
+                'start': current,
+                'end': next_time,
+                'duration': str(next_time - current),
+                'missing_candles': missing_count
+            })
+        
+        # Print results
+        if gaps:
+            print(f"\nNumber of missing candles: {len(missing_timestamps)}")
+            print("List of missing candles:")
+            for timestamp in missing_timestamps:
+                print(f"- {timestamp}")
+        else:
+            print("No missing candles found.")
+        
+        return gaps